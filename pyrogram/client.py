@@ -565,7 +565,7 @@ class Client(Methods):
                 pts_count = getattr(update, "pts_count", None)
 
                 
-                self.storage.update_state(
+                await self.storage.update_state(
                     id=utils.get_channel_id(channel_id) if channel_id else 0,
                     pts=pts,
                     date=updates.date,
@@ -605,7 +605,7 @@ class Client(Methods):
 
                 self.dispatcher.updates_queue.put_nowait((update, users, chats))
         elif isinstance(updates, (raw.types.UpdateShortMessage, raw.types.UpdateShortChatMessage)):
-            self.storage.update_state(
+            await self.storage.update_state(
                     id=0,
                     pts=updates.pts,
                     date=updates.date,
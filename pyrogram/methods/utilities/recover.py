@@ -11,6 +11,29 @@ from pyrogram.raw.types.updates_too_long import UpdatesTooLong
 
 log = logging.getLogger(__name__)
 
+# How many diff pages to process before persisting the local state, so a
+# crash mid-recovery doesn't force refetching everything from scratch.
+STATE_FLUSH_PAGES = 25
+
+
+def _put_many(updates_queue, batch):
+    """
+    Enqueue a batch of updates at once.
+
+    Equivalent to calling put_nowait() per item, but extends the underlying
+    deque in one shot and only wakes as many waiting getters as needed.
+    """
+    if not batch:
+        return
+
+    updates_queue._queue.extend(batch)
+    updates_queue._unfinished_tasks += len(batch)
+    updates_queue._finished.clear()
+
+    for _ in range(min(len(batch), len(updates_queue._getters))):
+        updates_queue._wakeup_next(updates_queue._getters)
+
+
 class Recover:
     async def recover_updates(self: "pyrogram.Client"):
         """
@@ -28,6 +51,10 @@ class Recover:
         log.info("Started recovering...")
 
         prev_pts = 0
+        pages_since_flush = 0
+
+        users = {}
+        chats = {}
 
         while True:
             try:
@@ -45,7 +72,7 @@ class Recover:
                 break
 
             if isinstance(diff, DifferenceEmpty):
-                self.storage.update_state(
+                await self.storage.update_state(
                         id=state.id,
                         pts=local_pts,
                         date=diff.date,
@@ -54,7 +81,7 @@ class Recover:
                 break
 
             if isinstance(diff, DifferenceTooLong):
-                self.storage.update_state(
+                await self.storage.update_state(
                         id=state.id,
                         pts=diff.pts,
                         date=local_date,
@@ -77,22 +104,35 @@ class Recover:
 
                 prev_pts = local_pts
 
-            
-            users = {u.id: u for u in diff.users}  # type: ignore
-            chats = {c.id: c for c in diff.chats}  # type: ignore
-
-            for message in diff.new_messages:
-                message_updates_counter += 1
-                self.dispatcher.updates_queue.put_nowait(
-                    (
-                        UpdateNewMessage(
-                            message=message,
-                            pts=local_pts,
-                            pts_count=-1
-                        ),
-                        users,
-                        chats
-                    )
+            pages_since_flush += 1
+
+            if pages_since_flush >= STATE_FLUSH_PAGES:
+                await self.storage.update_state(
+                        id=state.id,
+                        pts=local_pts,
+                        date=local_date,
+                        seq=local_seq
+                )
+                pages_since_flush = 0
+
+            users.update((u.id, u) for u in diff.users)  # type: ignore
+            chats.update((c.id, c) for c in diff.chats)  # type: ignore
+
+            batch = [
+                (
+                    UpdateNewMessage(
+                        message=message,
+                        pts=local_pts,
+                        pts_count=-1
+                    ),
+                    users,
+                    chats
                 )
+                for message in diff.new_messages
+            ]
+
+            message_updates_counter += len(batch)
+
+            _put_many(self.dispatcher.updates_queue, batch)
 
         log.info("Recovered %s messages and %s updates", message_updates_counter, other_updates_counter)
@@ -18,7 +18,6 @@
 
 import logging
 import os
-import sqlite3
 from pathlib import Path
 
 from .sqlite_storage import SQLiteStorage
@@ -34,37 +33,61 @@ class FileStorage(SQLiteStorage):
 
         self.database = workdir / (self.name + self.FILE_EXTENSION)
 
-    def update(self):
-        version = self.version()
+    async def update(self):
+        version = await self.version()
 
         if version == 1:
-            with self.conn:
-                self.conn.execute("DELETE FROM peers")
+            self.conn.execute("DELETE FROM peers")
 
             version += 1
 
         if version == 2:
-            with self.conn:
-                self.conn.execute("ALTER TABLE sessions ADD api_id INTEGER")
+            self.conn.execute("ALTER TABLE sessions ADD api_id INTEGER")
 
             version += 1
 
-        self.version(version)
+        if version == 3:
+            self.conn.execute("ALTER TABLE peers ADD input_peer BLOB")
+
+            version += 1
+
+        if version == 4:
+            self.conn.execute("DROP INDEX IF EXISTS idx_peers_username")
+            self.conn.execute(
+                "CREATE INDEX idx_peers_username ON peers (username, last_update_on DESC)"
+            )
+
+            version += 1
+
+        if version == 5:
+            self.conn.execute("DROP INDEX IF EXISTS idx_peers_id")
+
+            version += 1
+
+        if version == 6:
+            self.conn.execute("DROP TRIGGER IF EXISTS trg_peers_last_update_on")
+
+            version += 1
+
+        await self.version(version)
 
     async def open(self):
         path = self.database
         file_exists = path.is_file()
 
-        self.conn = sqlite3.connect(str(path), timeout=1, check_same_thread=False)
+        self.conn = self._connect(str(path))
 
         if not file_exists:
             self.create()
         else:
+            self._apply_pragmas()
             self.create_or_exists_table_state()
-            self.update()
+            await self.update()
+            self._load_session()
+
+        self.conn.execute("VACUUM")
 
-        with self.conn:
-            self.conn.execute("VACUUM")
+        self._open_readers(str(path))
 
     async def delete(self):
         os.remove(self.database)
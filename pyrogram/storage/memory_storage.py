@@ -18,7 +18,6 @@
 
 import base64
 import logging
-import sqlite3
 import struct
 
 from .sqlite_storage import SQLiteStorage
@@ -33,7 +32,7 @@ class MemoryStorage(SQLiteStorage):
         self.session_string = session_string
 
     async def open(self):
-        self.conn = sqlite3.connect(":memory:", check_same_thread=False)
+        self.conn = self._connect(":memory:")
         self.create()
 
         if self.session_string:
@@ -16,17 +16,44 @@
 #  You should have received a copy of the GNU Lesser General Public License
 #  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
 
-import inspect
+import asyncio
+import os
+import queue
 import sqlite3
 import time
-from typing import List, Tuple, Any
+from contextlib import contextmanager
+from io import BytesIO
+from typing import List, Tuple, Any, Union
 
 from pyrogram import raw
 from .storage import Storage
 from .. import utils
 
+try:
+    import apsw
+except ImportError:
+    apsw = None
+
+def _sqlite_version_info() -> Tuple[int, ...]:
+    """Version of the SQLite library queries actually run against: apsw
+    bundles its own build, which can differ from the stdlib's.
+    """
+    if apsw is not None:
+        return tuple(int(part) for part in apsw.sqlitelibversion().split("."))
+
+    return sqlite3.sqlite_version_info
+
+
+# unixepoch() is a native integer builtin in SQLite >= 3.38 and cheaper than
+# formatting a timestamp through STRFTIME; fall back on older libraries.
+_NOW = (
+    "unixepoch()"
+    if _sqlite_version_info() >= (3, 38, 0)
+    else "CAST(STRFTIME('%s', 'now') AS INTEGER)"
+)
+
 # language=SQLite
-SCHEMA = """
+SCHEMA = f"""
 CREATE TABLE sessions
 (
     dc_id     INTEGER PRIMARY KEY,
@@ -45,7 +72,8 @@ CREATE TABLE peers
     type           INTEGER NOT NULL,
     username       TEXT,
     phone_number   TEXT,
-    last_update_on INTEGER NOT NULL DEFAULT (CAST(STRFTIME('%s', 'now') AS INTEGER))
+    last_update_on INTEGER NOT NULL DEFAULT ({_NOW}),
+    input_peer     BLOB
 );
 
 CREATE TABLE version
@@ -53,41 +81,261 @@ CREATE TABLE version
     number INTEGER PRIMARY KEY
 );
 
-CREATE INDEX idx_peers_id ON peers (id);
-CREATE INDEX idx_peers_username ON peers (username);
+CREATE INDEX idx_peers_username ON peers (username, last_update_on DESC);
 CREATE INDEX idx_peers_phone_number ON peers (phone_number);
+"""
+
+# language=SQLite
+PRAGMAS = """
+PRAGMA journal_mode=WAL;
+PRAGMA synchronous=NORMAL;
+PRAGMA temp_store=MEMORY;
+PRAGMA cache_size=-20000;
+PRAGMA busy_timeout=5000;
+PRAGMA foreign_keys=ON;
+PRAGMA mmap_size=268435456;
+"""
 
-CREATE TRIGGER trg_peers_last_update_on
-    AFTER UPDATE
-    ON peers
-BEGIN
-    UPDATE peers
-    SET last_update_on = CAST(STRFTIME('%s', 'now') AS INTEGER)
-    WHERE id = NEW.id;
-END;
+# Subset of PRAGMAS valid on read-only connections (journal_mode and
+# synchronous require write access and are set by the writer).
+# language=SQLite
+READER_PRAGMAS = """
+PRAGMA temp_store=MEMORY;
+PRAGMA cache_size=-20000;
+PRAGMA busy_timeout=5000;
+PRAGMA mmap_size=268435456;
 """
 
+# language=SQLite
+_SQL_UPDATE_PEERS = (
+    "INSERT INTO peers (id, access_hash, type, username, phone_number, input_peer) "
+    "VALUES (?, ?, ?, ?, ?, ?) "
+    "ON CONFLICT (id) DO UPDATE SET "
+    "access_hash = excluded.access_hash, "
+    "type = excluded.type, "
+    "username = excluded.username, "
+    "phone_number = excluded.phone_number, "
+    "input_peer = excluded.input_peer, "
+    f"last_update_on = {_NOW}"
+)
 
-def get_input_peer(peer_id: int, access_hash: int, peer_type: str):
-    if peer_type in ["user", "bot"]:
-        return raw.types.InputPeerUser(
-            user_id=peer_id,
-            access_hash=access_hash
-        )
+# language=SQLite
+_SQL_GET_PEER_BY_ID = "SELECT input_peer, id, access_hash, type FROM peers WHERE id = ?"
 
-    if peer_type == "group":
-        return raw.types.InputPeerChat(
-            chat_id=-peer_id
-        )
+# language=SQLite
+_SQL_GET_PEER_BY_USERNAME = (
+    "SELECT input_peer, id, access_hash, type FROM peers "
+    "WHERE username = ? AND last_update_on > ? "
+    "ORDER BY last_update_on DESC LIMIT 1"
+)
+
+# language=SQLite
+_SQL_GET_PEER_BY_PHONE_NUMBER = (
+    "SELECT input_peer, id, access_hash, type FROM peers WHERE phone_number = ?"
+)
+
+# language=SQLite
+_SQL_GET_STATE = "SELECT id, pts, date, qts, seq FROM state WHERE id = ?"
+
+# language=SQLite
+_SQL_UPDATE_STATE = (
+    "INSERT INTO state (id, pts, date, qts, seq) "
+    "VALUES (?, ?, ?, ?, ?) "
+    "ON CONFLICT (id) DO UPDATE SET "
+    "pts = excluded.pts, "
+    "date = excluded.date, "
+    "qts = excluded.qts, "
+    "seq = excluded.seq"
+)
+
+# language=SQLite
+_SQL_RESET_STATE = "UPDATE state SET pts = 1 WHERE id = ?"
+
+_SESSION_COLUMNS = ("dc_id", "api_id", "test_mode", "auth_key", "date", "user_id", "is_bot")
+
+# language=SQLite
+_SQL_GET_SESSION = f"SELECT {', '.join(_SESSION_COLUMNS)} FROM sessions"
+
+# language=SQLite
+_SQL_SAVE_SESSION = f"UPDATE sessions SET {', '.join(f'{column} = ?' for column in _SESSION_COLUMNS)}"
+
+
+class _APSWRow:
+    """Minimal sqlite3.Row stand-in: indexable by position, slice or name."""
+    __slots__ = ("_values", "_names")
+
+    def __init__(self, values, names):
+        self._values = values
+        self._names = names
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return self._values[self._names[key]]
+
+        return self._values[key]
+
+    def __iter__(self):
+        return iter(self._values)
+
+    def __len__(self):
+        return len(self._values)
+
+
+class _APSWCursor:
+    """Wraps an apsw cursor so fetched rows behave like sqlite3.Row."""
+    __slots__ = ("_cursor", "_names")
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+        try:
+            self._names = {d[0]: i for i, d in enumerate(cursor.getdescription())}
+        except apsw.ExecutionCompleteError:
+            self._names = None
 
-    if peer_type in ["channel", "supergroup"]:
-        return raw.types.InputPeerChannel(
-            channel_id=utils.get_channel_id(peer_id),
-            access_hash=access_hash
+    def fetchone(self):
+        row = self._cursor.fetchone()
+
+        if row is None:
+            return None
+
+        return _APSWRow(row, self._names)
+
+
+class _APSWConnection:
+    """sqlite3-like facade over an apsw connection.
+
+    apsw binds SQLite's C API directly: statements are cached on the
+    connection, connections are usable from any thread and there are no
+    implicit transactions, matching how the sqlite3 connections here are
+    configured (check_same_thread=False, isolation_level=None).
+    """
+    __slots__ = ("_conn",)
+
+    def __init__(self, database: str, read_only: bool = False):
+        self._conn = apsw.Connection(
+            database,
+            flags=(
+                apsw.SQLITE_OPEN_READONLY
+                if read_only else
+                apsw.SQLITE_OPEN_READWRITE | apsw.SQLITE_OPEN_CREATE
+            )
         )
 
+    def execute(self, sql: str, parameters: tuple = ()):
+        return _APSWCursor(self._conn.cursor().execute(sql, parameters))
+
+    def executemany(self, sql: str, seq_of_parameters):
+        return _APSWCursor(self._conn.cursor().executemany(sql, seq_of_parameters))
+
+    def executescript(self, script: str):
+        return _APSWCursor(self._conn.cursor().execute(script))
+
+    def commit(self):
+        if not self._conn.getautocommit():
+            self._conn.cursor().execute("COMMIT")
+
+    def close(self):
+        self._conn.close()
+
+_SENTINEL = object()
+
+
+def _to_thread(func, *args):
+    """Run func in the default executor.
+
+    Stand-in for asyncio.to_thread, which needs Python >= 3.9 while the
+    minimum supported version is 3.7.
+    """
+    return asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+
+def _accessor(column: str, flush: bool = False):
+    """Build an async accessor bound to a single ``sessions`` column.
+
+    Values live in the in-memory session cache loaded at open() time; writes
+    mutate the cache and mark the storage dirty so save() flushes the whole
+    row back in one statement. Columns that must never be lost to a crash
+    (the authorization itself) pass flush=True to persist on every set.
+    """
+    async def accessor(self, value: Any = _SENTINEL):
+        if value is _SENTINEL:
+            return self._session[column]
+
+        self._session[column] = value
+        self._dirty = True
+
+        if flush:
+            await self.save()
+
+    accessor.__name__ = column
+
+    return accessor
+
+
+# Compact integer labels stored in peers.type (the column was always declared
+# INTEGER, but used to hold the string names). Bots share PEER_TYPE_USER and
+# supergroups PEER_TYPE_CHANNEL, since access_hash already tells them apart.
+PEER_TYPE_USER = 0
+PEER_TYPE_GROUP = 1
+PEER_TYPE_CHANNEL = 2
+
+_PEER_TYPE_IDS = {
+    "user": PEER_TYPE_USER,
+    "bot": PEER_TYPE_USER,
+    "group": PEER_TYPE_GROUP,
+    "channel": PEER_TYPE_CHANNEL,
+    "supergroup": PEER_TYPE_CHANNEL
+}
+
+
+def _build_input_peer_user(peer_id: int, access_hash: int):
+    return raw.types.InputPeerUser(
+        user_id=peer_id,
+        access_hash=access_hash
+    )
+
+
+def _build_input_peer_group(peer_id: int, access_hash: int):
+    return raw.types.InputPeerChat(
+        chat_id=-peer_id
+    )
+
+
+def _build_input_peer_channel(peer_id: int, access_hash: int):
+    return raw.types.InputPeerChannel(
+        channel_id=utils.get_channel_id(peer_id),
+        access_hash=access_hash
+    )
+
+
+_INPUT_PEER_BUILDERS = [
+    _build_input_peer_user,
+    _build_input_peer_group,
+    _build_input_peer_channel
+]
+
+
+def get_input_peer(peer_id: int, access_hash: int, peer_type: Union[int, str]):
+    if isinstance(peer_type, str):
+        # Rows written before the integer labels store the string name
+        peer_type = _PEER_TYPE_IDS.get(peer_type, -1)
+
+    if 0 <= peer_type < len(_INPUT_PEER_BUILDERS):
+        return _INPUT_PEER_BUILDERS[peer_type](peer_id, access_hash)
+
     raise ValueError(f"Invalid peer type: {peer_type}")
 
+
+def _read_input_peer(r):
+    """Deserialize the stored InputPeer blob, rebuilding it from the raw
+    columns for rows written before the blob column existed.
+    """
+    if r[0] is not None:
+        return raw.core.TLObject.read(BytesIO(r[0]))
+
+    return get_input_peer(*r[1:4])
+
 from typing import Tuple, List, Optional
 
 
@@ -102,6 +350,8 @@ class State:
         qts (int): The QTS value.
         seq (int): The SEQ value.
     """
+    __slots__ = ("id", "pts", "date", "qts", "seq")
+
     def __init__(self, id: int, pts: int, date: int, qts: Optional[int],  seq: Optional[int]):
         self.id = id 
         self.pts = pts
@@ -119,16 +369,15 @@ class StateMixin:
     conn: sqlite3.Connection
 
     def create_or_exists_table_state(self):
-        with self.conn:
-            self.conn.executescript("""
-                CREATE TABLE IF NOT EXISTS state (
-                    id   INTEGER PRIMARY KEY,
-                    pts  INTEGER,
-                    date INTEGER,
-                    qts  INTEGER,
-                    seq  INTEGER
-                )
-            """)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS state (
+                id   INTEGER PRIMARY KEY,
+                pts  INTEGER,
+                date INTEGER,
+                qts  INTEGER,
+                seq  INTEGER
+            )
+        """)
 
     def get_state(self, id: int) -> State:
         """
@@ -141,18 +390,20 @@ class StateMixin:
         Returns:
             Optional[State]: A State object if found, otherwise None.
         """
-        query = "SELECT id, pts, date, qts, seq FROM state WHERE id = ?"
-        cursor = self.conn.execute(query, (id,))
+        cursor = self.conn.execute(_SQL_GET_STATE, (id,))
         row = cursor.fetchone()
 
         if row is None:
             return State.default(id)
 
-        return State(*row)
+        return State(row["id"], row["pts"], row["date"], row["qts"], row["seq"])
+
+    def _update_state_sync(self, id: int, pts: int, date: int, qts: Optional[int], seq: Optional[int]):
+        self.conn.execute(_SQL_UPDATE_STATE, (id, pts, date, qts, seq))
 
-    def update_state(self, id: int, pts: int, date: Optional[int], qts: Optional[int] = None,  seq: Optional[int] = None):
+    async def update_state(self, id: int, pts: int, date: Optional[int], qts: Optional[int] = None,  seq: Optional[int] = None):
         """
-        Insert or update a state entry using REPLACE INTO (upsert behavior).
+        Insert or update a state entry (upsert behavior).
 
         Args:
             id (int): The ID of the state.
@@ -162,15 +413,15 @@ class StateMixin:
             seq (int): The sequence number.
         """
         if date is None:
-            date = int(int(time.time()))
-        query = """
-            REPLACE INTO state (id, pts, date, qts, seq)
-            VALUES (?, ?, ?, ?, ?)
-        """
-        self.conn.execute(query, (id, pts, date, qts, seq))
-        self.conn.commit()
+            date = int(time.time())
 
-    def reset_state(self, id: int):
+        async with self._get_write_lock():
+            await _to_thread(self._update_state_sync, id, pts, date, qts, seq)
+
+    def _reset_state_sync(self, id: int):
+        self.conn.execute(_SQL_RESET_STATE, (id,))
+
+    async def reset_state(self, id: int):
         """
         Reset a state entry by ID.
         Instead of deleting the row, set pts = 1.
@@ -178,14 +429,13 @@ class StateMixin:
         Args:
             id (int): The ID of the state to reset.
         """
-        query = "UPDATE state SET pts = 1 WHERE id = ?"
-        self.conn.execute(query, (id,))
-        self.conn.commit()
+        async with self._get_write_lock():
+            await _to_thread(self._reset_state_sync, id)
 
 
 
 class SQLiteStorage(Storage, StateMixin):
-    VERSION = 3
+    VERSION = 7
     USERNAME_TTL = 8 * 60 * 60
 
     conn: sqlite3.Connection
@@ -193,127 +443,255 @@ class SQLiteStorage(Storage, StateMixin):
     def __init__(self, name: str):
         super().__init__(name)
 
+        # SQLite allows a single writer at a time: writes are serialized by
+        # _get_write_lock() so they can be offloaded to worker threads without
+        # racing each other. Created lazily: before Python 3.10 an
+        # asyncio.Lock binds the loop current at construction time, which may
+        # differ from the one the client is later driven by.
+        self._write_lock = None
+
+        # Pool of read-only connections (WAL mode supports many readers
+        # alongside the single writer). Empty until _open_readers() is called.
+        self._readers: "queue.SimpleQueue[sqlite3.Connection]" = queue.SimpleQueue()
+        self._reader_count = 0
+
+        # Tracks whether anything was written since the last save(), so idle
+        # save loops don't keep dirtying and flushing the date column.
+        self._dirty = False
+        self._last_saved_date = 0
+
+        # In-memory copy of the single sessions row, loaded by _load_session()
+        self._session = {}
+
+    @staticmethod
+    def _connect(database: str, read_only: bool = False):
+        """Open a database connection, preferring apsw when installed."""
+        if apsw is not None:
+            return _APSWConnection(database, read_only)
+
+        if read_only:
+            conn = sqlite3.connect(
+                f"file:{database}?mode=ro",
+                timeout=1,
+                check_same_thread=False,
+                cached_statements=256,
+                isolation_level=None,
+                uri=True
+            )
+        else:
+            conn = sqlite3.connect(
+                database,
+                timeout=1,
+                check_same_thread=False,
+                cached_statements=256,
+                isolation_level=None
+            )
+
+        conn.row_factory = sqlite3.Row
+
+        return conn
+
+    def _get_write_lock(self) -> asyncio.Lock:
+        if self._write_lock is None:
+            self._write_lock = asyncio.Lock()
+
+        return self._write_lock
+
+    def _apply_pragmas(self):
+        self.conn.executescript(PRAGMAS)
+
+    def _open_readers(self, path: str):
+        for _ in range(os.cpu_count() or 1):
+            conn = self._connect(path, read_only=True)
+
+            conn.executescript(READER_PRAGMAS)
+
+            self._readers.put(conn)
+            self._reader_count += 1
+
+    @contextmanager
+    def _reader(self):
+        """Borrow a read-only connection from the pool.
+
+        Falls back to the writer connection when no pool exists (in-memory
+        sessions cannot be reopened read-only).
+        """
+        if not self._reader_count:
+            yield self.conn
+            return
+
+        conn = self._readers.get()
+
+        try:
+            yield conn
+        finally:
+            self._readers.put(conn)
+
     def create(self):
-        with self.conn:
-            self.conn.executescript(SCHEMA)
+        # Must be set before the first page is written (and before switching
+        # to WAL) to take effect on the fresh database.
+        self.conn.execute("PRAGMA page_size=4096")
 
-            self.conn.execute(
-                "INSERT INTO version VALUES (?)",
-                (self.VERSION,)
-            )
+        self._apply_pragmas()
 
-            self.conn.execute(
-                "INSERT INTO sessions VALUES (?, ?, ?, ?, ?, ?, ?)",
-                (2, None, None, None, 0, None, None)
-            )
+        self.conn.executescript(SCHEMA)
+
+        self.conn.execute(
+            "INSERT INTO version VALUES (?)",
+            (self.VERSION,)
+        )
+
+        self.conn.execute(
+            "INSERT INTO sessions VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (2, None, None, None, 0, None, None)
+        )
 
         self.create_or_exists_table_state()
+        self._load_session()
+
+    def _load_session(self):
+        row = self.conn.execute(_SQL_GET_SESSION).fetchone()
+        self._session = {column: row[column] for column in _SESSION_COLUMNS}
 
     async def open(self):
         raise NotImplementedError
 
-    async def save(self):
-        await self.date(int(time.time()))
+    def _save_sync(self):
+        self.conn.execute(
+            _SQL_SAVE_SESSION,
+            tuple(self._session[column] for column in _SESSION_COLUMNS)
+        )
         self.conn.commit()
 
-    async def close(self):
+    async def save(self):
+        now = int(time.time())
+
+        if not self._dirty and now == self._last_saved_date:
+            return
+
+        self._session["date"] = now
+
+        async with self._get_write_lock():
+            await _to_thread(self._save_sync)
+
+        self._last_saved_date = now
+        self._dirty = False
+
+    def _close_sync(self):
+        for _ in range(self._reader_count):
+            self._readers.get().close()
+
+        self._reader_count = 0
         self.conn.close()
 
+    async def close(self):
+        await self.save()
+        await _to_thread(self._close_sync)
+
     async def delete(self):
         raise NotImplementedError
 
-    async def update_peers(self, peers: List[Tuple[int, int, str, str, str]]):
-        self.conn.executemany(
-            "REPLACE INTO peers (id, access_hash, type, username, phone_number)"
-            "VALUES (?, ?, ?, ?, ?)",
-            peers
-        )
+    def _update_peers_sync(self, peers: List[Tuple[int, int, str, str, str]]):
+        rows = []
 
-    async def get_peer_by_id(self, peer_id: int):
-        r = self.conn.execute(
-            "SELECT id, access_hash, type FROM peers WHERE id = ?",
-            (peer_id,)
-        ).fetchone()
-
-        if r is None:
-            raise KeyError(f"ID not found: {peer_id}")
+        for peer_id, access_hash, peer_type, username, phone_number in peers:
+            peer_type = _PEER_TYPE_IDS.get(peer_type, peer_type)
 
-        return get_input_peer(*r)
+            try:
+                input_peer = get_input_peer(peer_id, access_hash, peer_type).write()
+            except AttributeError:
+                # access_hash is optional in the TL schema and may be None;
+                # such peers can't be serialized, so store a NULL blob and
+                # let _read_input_peer rebuild them from the raw columns.
+                input_peer = None
 
-    async def get_peer_by_username(self, username: str):
-        r = self.conn.execute(
-            "SELECT id, access_hash, type, last_update_on FROM peers WHERE username = ?"
-            "ORDER BY last_update_on DESC",
-            (username,)
-        ).fetchone()
+            rows.append((
+                peer_id, access_hash, peer_type, username, phone_number,
+                input_peer
+            ))
 
-        if r is None:
-            raise KeyError(f"Username not found: {username}")
+        self.conn.execute("BEGIN IMMEDIATE")
 
-        if abs(time.time() - r[3]) > self.USERNAME_TTL:
-            raise KeyError(f"Username expired: {username}")
+        try:
+            self.conn.executemany(_SQL_UPDATE_PEERS, rows)
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
 
-        return get_input_peer(*r[:3])
+        self.conn.execute("COMMIT")
+        self._dirty = True
 
-    async def get_peer_by_phone_number(self, phone_number: str):
-        r = self.conn.execute(
-            "SELECT id, access_hash, type FROM peers WHERE phone_number = ?",
-            (phone_number,)
-        ).fetchone()
-
-        if r is None:
-            raise KeyError(f"Phone number not found: {phone_number}")
+    async def update_peers(self, peers: List[Tuple[int, int, str, str, str]]):
+        peers = list(peers)
 
-        return get_input_peer(*r)
+        if not peers:
+            return
 
-    def _get(self):
-        attr = inspect.stack()[2].function
+        async with self._get_write_lock():
+            await _to_thread(self._update_peers_sync, peers)
 
-        return self.conn.execute(
-            f"SELECT {attr} FROM sessions"
-        ).fetchone()[0]
+    def _get_peer_by_id_sync(self, peer_id: int):
+        with self._reader() as conn:
+            r = conn.execute(_SQL_GET_PEER_BY_ID, (peer_id,)).fetchone()
 
-    def _set(self, value: Any):
-        attr = inspect.stack()[2].function
+        if r is None:
+            raise KeyError(f"ID not found: {peer_id}")
 
-        with self.conn:
-            self.conn.execute(
-                f"UPDATE sessions SET {attr} = ?",
-                (value,)
-            )
+        return _read_input_peer(r)
 
-    def _accessor(self, value: Any = object):
-        return self._get() if value == object else self._set(value)
+    async def get_peer_by_id(self, peer_id: int):
+        return await _to_thread(self._get_peer_by_id_sync, peer_id)
 
-    async def dc_id(self, value: int = object):
-        return self._accessor(value)
+    def _get_peer_by_username_sync(self, username: str):
+        with self._reader() as conn:
+            r = conn.execute(
+                _SQL_GET_PEER_BY_USERNAME,
+                (username, int(time.time()) - self.USERNAME_TTL)
+            ).fetchone()
 
-    async def api_id(self, value: int = object):
-        return self._accessor(value)
+        if r is None:
+            raise KeyError(f"Username not found: {username}")
 
-    async def test_mode(self, value: bool = object):
-        return self._accessor(value)
+        return _read_input_peer(r)
 
-    async def auth_key(self, value: bytes = object):
-        return self._accessor(value)
+    async def get_peer_by_username(self, username: str):
+        return await _to_thread(self._get_peer_by_username_sync, username)
 
-    async def date(self, value: int = object):
-        return self._accessor(value)
+    def _get_peer_by_phone_number_sync(self, phone_number: str):
+        with self._reader() as conn:
+            r = conn.execute(_SQL_GET_PEER_BY_PHONE_NUMBER, (phone_number,)).fetchone()
 
-    async def user_id(self, value: int = object):
-        return self._accessor(value)
+        if r is None:
+            raise KeyError(f"Phone number not found: {phone_number}")
 
-    async def is_bot(self, value: bool = object):
-        return self._accessor(value)
+        return _read_input_peer(r)
 
-    def version(self, value: int = object):
-        if value == object:
-            return self.conn.execute(
+    async def get_peer_by_phone_number(self, phone_number: str):
+        return await _to_thread(self._get_peer_by_phone_number_sync, phone_number)
+
+    dc_id = _accessor("dc_id")
+    api_id = _accessor("api_id")
+    test_mode = _accessor("test_mode")
+    auth_key = _accessor("auth_key", flush=True)
+    date = _accessor("date")
+    user_id = _accessor("user_id", flush=True)
+    is_bot = _accessor("is_bot", flush=True)
+
+    def _version_get_sync(self):
+        with self._reader() as conn:
+            return conn.execute(
                 "SELECT number FROM version"
             ).fetchone()[0]
-        else:
-            with self.conn:
-                self.conn.execute(
-                    "UPDATE version SET number = ?",
-                    (value,)
-                )
+
+    def _version_set_sync(self, value: int):
+        self.conn.execute(
+            "UPDATE version SET number = ?",
+            (value,)
+        )
+
+    async def version(self, value: int = _SENTINEL):
+        if value is _SENTINEL:
+            return await _to_thread(self._version_get_sync)
+
+        async with self._get_write_lock():
+            await _to_thread(self._version_set_sync, value)
@@ -0,0 +1,129 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+import sqlite3
+
+import pytest
+
+from pyrogram.storage.file_storage import FileStorage
+
+# The on-disk layout of a version 3 session file, as written before the
+# input_peer blob, the composite username index, the integer peer-type
+# labels and the trigger removal.
+V3_SCHEMA = """
+CREATE TABLE sessions
+(
+    dc_id     INTEGER PRIMARY KEY,
+    api_id    INTEGER,
+    test_mode INTEGER,
+    auth_key  BLOB,
+    date      INTEGER NOT NULL,
+    user_id   INTEGER,
+    is_bot    INTEGER
+);
+
+CREATE TABLE peers
+(
+    id             INTEGER PRIMARY KEY,
+    access_hash    INTEGER,
+    type           INTEGER NOT NULL,
+    username       TEXT,
+    phone_number   TEXT,
+    last_update_on INTEGER NOT NULL DEFAULT (CAST(STRFTIME('%s', 'now') AS INTEGER))
+);
+
+CREATE TABLE version
+(
+    number INTEGER PRIMARY KEY
+);
+
+CREATE INDEX idx_peers_id ON peers (id);
+CREATE INDEX idx_peers_username ON peers (username);
+CREATE INDEX idx_peers_phone_number ON peers (phone_number);
+
+CREATE TRIGGER trg_peers_last_update_on
+    AFTER UPDATE
+    ON peers
+BEGIN
+    UPDATE peers
+    SET last_update_on = CAST(STRFTIME('%s', 'now') AS INTEGER)
+    WHERE id = NEW.id;
+END;
+"""
+
+AUTH_KEY = b"\x01" * 256
+
+
+def create_v3_session(path):
+    conn = sqlite3.connect(str(path))
+    conn.executescript(V3_SCHEMA)
+    conn.execute("INSERT INTO version VALUES (3)")
+    conn.execute(
+        "INSERT INTO sessions VALUES (?, ?, ?, ?, ?, ?, ?)",
+        (2, 12345, 0, AUTH_KEY, 0, 42, 0)
+    )
+    conn.executemany(
+        "INSERT INTO peers (id, access_hash, type, username, phone_number)"
+        "VALUES (?, ?, ?, ?, ?)",
+        [
+            (101, 777, "user", "alice", "39123456789"),
+            (-102, 0, "group", None, None),
+            (-1001000000103, 888, "channel", "channel", None)
+        ]
+    )
+    conn.commit()
+    conn.close()
+
+
+@pytest.mark.asyncio
+async def test_v3_session_migrates_to_current_version(tmp_path):
+    create_v3_session(tmp_path / ("test" + FileStorage.FILE_EXTENSION))
+
+    storage = FileStorage("test", tmp_path)
+    await storage.open()
+
+    assert await storage.version() == FileStorage.VERSION
+
+    # Session columns survive the migration
+    assert await storage.dc_id() == 2
+    assert await storage.api_id() == 12345
+    assert await storage.auth_key() == AUTH_KEY
+    assert await storage.user_id() == 42
+    assert await storage.is_bot() == 0
+
+    # Legacy rows (string type labels, no input_peer blob) still resolve
+    assert (await storage.get_peer_by_id(101)).user_id == 101
+    assert (await storage.get_peer_by_id(-102)).chat_id == 102
+    assert (await storage.get_peer_by_id(-1001000000103)).channel_id == 1000000103
+    assert (await storage.get_peer_by_username("alice")).access_hash == 777
+
+    # Upserts on top of legacy rows work after the migration
+    await storage.update_peers([(101, 778, "user", "alice", "39123456789")])
+    assert (await storage.get_peer_by_id(101)).access_hash == 778
+
+    await storage.close()
+
+    # Reopening must not run the migration chain again
+    storage = FileStorage("test", tmp_path)
+    await storage.open()
+
+    assert await storage.version() == FileStorage.VERSION
+    assert await storage.auth_key() == AUTH_KEY
+    assert (await storage.get_peer_by_id(101)).access_hash == 778
+
+    await storage.close()